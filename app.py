@@ -1,8 +1,5 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import tempfile
-import os
 from nutrition_calculator import NutritionCalculator
 from meal_planner import MealPlanner  
 from pdf_generator import PDFGenerator
@@ -25,6 +22,46 @@ def load_components():
 
 calculator, planner, pdf_gen = load_components()
 
+# Meal plans are pure functions of their inputs, so identical requests
+# across reruns are served from cache. Targets are passed as sorted item
+# tuples to keep the cache key cheap to hash.
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_meal_plan(target_items, dietary_preference, region, variation=1):
+    return planner.generate_meal_plan(
+        dict(target_items), dietary_preference, region, variation=variation
+    )
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_variations(target_items, dietary_preference, region, num_variations=3):
+    return planner.get_multiple_variations(
+        dict(target_items), dietary_preference, region, num_variations=num_variations
+    )
+
+@st.cache_data(show_spinner=False)
+def _macro_pie(protein_pct, carbs_pct, fat_pct):
+    import plotly.graph_objects as go
+    fig = go.Figure(go.Pie(
+        values=[protein_pct, carbs_pct, fat_pct],
+        labels=['Protein', 'Carbs', 'Fat'],
+        marker_colors=['#ff9999', '#66b3ff', '#99ff99'],
+        sort=False,
+        direction='counterclockwise',
+        rotation=90,
+        hole=0
+    ))
+    fig.update_layout(title_text='<b>Macro Distribution</b>', title_font_size=14)
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _comparison_df(target, actual):
+    comparison_df = pd.DataFrame({
+        'Nutrient': ['Calories', 'Protein (g)', 'Carbs (g)', 'Fat (g)'],
+        'Target': list(target),
+        'Actual': list(actual)
+    })
+    comparison_df['Difference'] = comparison_df['Actual'] - comparison_df['Target']
+    return comparison_df
+
 # App Header-1
 st.title("🍽️ Indian Nutrition Planner")
 st.markdown("---")
@@ -68,35 +105,10 @@ region = st.sidebar.selectbox(
 # Generate meal plan button
 generate_plan = st.sidebar.button("🔄 Generate Meal Plan", type="primary")
 
-# Main content area
-if generate_plan or 'meal_plan' in st.session_state:
-    if generate_plan:
-        # Calculate nutrition requirements
-        daily_calories = calculator.calculate_daily_calories(
-            weight, height, age, gender, activity_level, goal
-        )
-        target_nutrition = calculator.calculate_macros(daily_calories)
-        bmi, bmi_category = calculator.get_bmi(weight, height)
-        
-        # Store user info and nutrition data
-        st.session_state.user_info = {
-            'age': age, 'gender': gender, 'weight': weight, 'height': height,
-            'activity_level': activity_level, 'goal': goal,
-            'dietary_preference': dietary_preference, 'region': region,
-            'bmi': bmi, 'bmi_category': bmi_category
-        }
-        st.session_state.target_nutrition = target_nutrition
-        
-        # Generate meal plan
-        try:
-            meal_plan = planner.generate_meal_plan(
-                target_nutrition, dietary_preference, region
-            )
-            st.session_state.meal_plan = meal_plan
-        except Exception as e:
-            st.error(f"Error generating meal plan: {str(e)}")
-            st.stop()
-    
+# Results are rendered in a fragment so that its own buttons (new variation,
+# multiple variations, PDF) rerun only this section instead of the whole script.
+@st.fragment
+def _render_results():
     # Display results
     user_info = st.session_state.user_info
     target_nutrition = st.session_state.target_nutrition
@@ -130,24 +142,11 @@ if generate_plan or 'meal_plan' in st.session_state:
         # Nutrition comparison
         st.subheader("Target vs Actual Nutrition")
         
-        comparison_data = {
-            'Nutrient': ['Calories', 'Protein (g)', 'Carbs (g)', 'Fat (g)'],
-            'Target': [
-                target_nutrition['calories'],
-                target_nutrition['protein'],
-                target_nutrition['carbs'], 
-                target_nutrition['fat']
-            ],
-            'Actual': [
-                meal_plan['daily_totals']['calories'],
-                meal_plan['daily_totals']['protein'],
-                meal_plan['daily_totals']['carbs'],
-                meal_plan['daily_totals']['fat']
-            ]
-        }
-        
-        comparison_df = pd.DataFrame(comparison_data)
-        comparison_df['Difference'] = comparison_df['Actual'] - comparison_df['Target']
+        nutrients = ('calories', 'protein', 'carbs', 'fat')
+        comparison_df = _comparison_df(
+            tuple(target_nutrition[n] for n in nutrients),
+            tuple(meal_plan['daily_totals'][n] for n in nutrients)
+        )
         
         st.dataframe(comparison_df, use_container_width=True)
     
@@ -170,16 +169,11 @@ if generate_plan or 'meal_plan' in st.session_state:
             carbs_pct = (carbs_cal / total_macro_cal) * 100
             fat_pct = (fat_cal / total_macro_cal) * 100
             
-            fig, ax = plt.subplots(figsize=(8, 8))
-            
-            sizes = [protein_pct, carbs_pct, fat_pct]
-            labels = [f'Protein\n{protein_pct:.1f}%', f'Carbs\n{carbs_pct:.1f}%', f'Fat\n{fat_pct:.1f}%']
-            colors = ['#ff9999', '#66b3ff', '#99ff99']
-            
-            ax.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
-            ax.set_title('Macro Distribution', fontsize=14, fontweight='bold')
-            
-            st.pyplot(fig)
+            # Rounded so reruns with the same macros reuse the cached figure
+            st.plotly_chart(
+                _macro_pie(round(protein_pct, 1), round(carbs_pct, 1), round(fat_pct, 1)),
+                use_container_width=True
+            )
         
         # Fiber info
         st.metric("Daily Fiber", f"{daily_totals['fiber']:.1f}g")
@@ -206,23 +200,15 @@ if generate_plan or 'meal_plan' in st.session_state:
         with tabs[i]:
             st.subheader(f"{meal_names[meal_type]} Details")
             
-            # Food items
-            for food in meal_data['foods']:
-                with st.container():
-                    food_col1, food_col2, food_col3 = st.columns([2, 1, 2])
-                    
-                    with food_col1:
-                        st.write(f"**{food['name']}**")
-                        st.write(f"Serving: {food['serving_size']:.0f}g")
-                    
-                    with food_col2:
-                        st.metric("Calories", f"{food['calories']:.0f}")
-                    
-                    with food_col3:
-                        st.write(f"Protein: {food['protein']:.1f}g")
-                        st.write(f"Carbs: {food['carbs']:.1f}g | Fat: {food['fat']:.1f}g")
-                    
-                    st.markdown("---")
+            # Food items, sent to the browser as a single table element
+            meal_df = pd.DataFrame(
+                meal_data['foods'],
+                columns=['name', 'serving_size', 'calories', 'protein', 'carbs', 'fat']
+            ).rename(columns={
+                'name': 'Food', 'serving_size': 'Serving (g)', 'calories': 'Cal',
+                'protein': 'P(g)', 'carbs': 'C(g)', 'fat': 'F(g)'
+            })
+            st.dataframe(meal_df, use_container_width=True, hide_index=True)
             
             # Meal totals
             totals = meal_data['totals']
@@ -242,21 +228,24 @@ if generate_plan or 'meal_plan' in st.session_state:
         if st.button("🔄 Generate New Variation"):
             # Generate new variation
             try:
-                new_meal_plan = planner.generate_meal_plan(
-                    target_nutrition, dietary_preference, region, 
+                new_meal_plan = _cached_meal_plan(
+                    tuple(sorted(target_nutrition.items())),
+                    user_info['dietary_preference'], user_info['region'],
                     variation=st.session_state.get('variation_count', 1) + 1
                 )
                 st.session_state.meal_plan = new_meal_plan
                 st.session_state.variation_count = st.session_state.get('variation_count', 1) + 1
-                st.rerun()
+                st.rerun(scope="fragment")
             except Exception as e:
                 st.error(f"Error generating new variation: {str(e)}")
     
     with action_col2:
         if st.button("📊 Generate Multiple Variations"):
             try:
-                variations = planner.get_multiple_variations(
-                    target_nutrition, dietary_preference, region, num_variations=3
+                variations = _cached_variations(
+                    tuple(sorted(target_nutrition.items())),
+                    user_info['dietary_preference'], user_info['region'],
+                    num_variations=3
                 )
                 st.session_state.variations = variations
                 st.success(f"Generated {len(variations)} variations!")
@@ -278,11 +267,9 @@ if generate_plan or 'meal_plan' in st.session_state:
             try:
                 # Generate PDF
                 with st.spinner("Generating PDF..."):
-                    pdf_path = pdf_gen.generate_meal_plan_pdf(meal_plan, user_info)
-                    
-                    # Read PDF file
-                    with open(pdf_path, 'rb') as pdf_file:
-                        pdf_data = pdf_file.read()
+                    # PDFGenerator keeps recently rendered reports, so a repeat
+                    # click for the same plan reuses the bytes
+                    pdf_data = pdf_gen.generate_meal_plan_pdf_bytes(meal_plan, user_info)
                     
                     st.download_button(
                         label="📥 Download Meal Plan PDF",
@@ -291,9 +278,6 @@ if generate_plan or 'meal_plan' in st.session_state:
                         mime="application/pdf"
                     )
                     
-                    # Clean up temporary file
-                    os.unlink(pdf_path)
-                    
             except Exception as e:
                 st.error(f"Error generating PDF: {str(e)}")
     
@@ -320,8 +304,8 @@ if generate_plan or 'meal_plan' in st.session_state:
     with st.expander("🔬 Nutritional Information"):
         st.write(f"""
         **Your Calculated Values:**
-        - **BMR (Basal Metabolic Rate):** {calculator.calculate_bmr(weight, height, age, gender):.0f} calories
-        - **TDEE (Total Daily Energy Expenditure):** {calculator.calculate_tdee(calculator.calculate_bmr(weight, height, age, gender), activity_level):.0f} calories
+        - **BMR (Basal Metabolic Rate):** {st.session_state.bmr:.0f} calories
+        - **TDEE (Total Daily Energy Expenditure):** {st.session_state.tdee:.0f} calories
         - **Adjusted for Goal:** {target_nutrition['calories']} calories
         
         **Macro Distribution:**
@@ -330,6 +314,41 @@ if generate_plan or 'meal_plan' in st.session_state:
         - **Fat:** 30% of total calories ({target_nutrition['fat']}g)
         """)
 
+# Main content area
+if generate_plan or 'meal_plan' in st.session_state:
+    if generate_plan:
+        # Calculate nutrition requirements
+        bmr = calculator.calculate_bmr(weight, height, age, gender)
+        tdee = calculator.calculate_tdee(bmr, activity_level)
+        daily_calories = calculator.calculate_daily_calories(
+            weight, height, age, gender, activity_level, goal
+        )
+        target_nutrition = calculator.calculate_macros(daily_calories)
+        bmi, bmi_category = calculator.get_bmi(weight, height)
+        
+        # Store user info and nutrition data
+        st.session_state.user_info = {
+            'age': age, 'gender': gender, 'weight': weight, 'height': height,
+            'activity_level': activity_level, 'goal': goal,
+            'dietary_preference': dietary_preference, 'region': region,
+            'bmi': bmi, 'bmi_category': bmi_category
+        }
+        st.session_state.target_nutrition = target_nutrition
+        st.session_state.bmr = bmr
+        st.session_state.tdee = tdee
+        
+        # Generate meal plan
+        try:
+            meal_plan = _cached_meal_plan(
+                tuple(sorted(target_nutrition.items())), dietary_preference, region
+            )
+            st.session_state.meal_plan = meal_plan
+        except Exception as e:
+            st.error(f"Error generating meal plan: {str(e)}")
+            st.stop()
+    
+    _render_results()
+
 else:
     # Welcome screen
     st.header("🙏 Welcome to Indian Nutrition Planner")
@@ -1,13 +1,92 @@
+import functools
+import hashlib
+import io
+import os
 import pandas as pd
 import numpy as np
-import random
+import pyarrow.parquet as pq
 from typing import Dict, List, Tuple, Optional
 
+try:
+    from streamlit import cache_data
+except ImportError:  # allow the planner to be used outside the Streamlit app
+    cache_data = lambda f: f
+
+
+# Meal-appropriate food categories
+_MEAL_CATEGORIES = {
+    'breakfast': ('Grains', 'South Indian', 'Dairy', 'Fruits', 'Beverages'),
+    'morning_snack': ('Fruits', 'Nuts', 'Snacks', 'Beverages'),
+    'lunch': ('Grains', 'Lentils', 'Vegetables', 'Dairy', 'Non-Veg'),
+    'evening_snack': ('Snacks', 'Fruits', 'Nuts', 'Beverages'),
+    'dinner': ('Grains', 'Lentils', 'Vegetables', 'South Indian', 'Non-Veg')
+}
+
+# Parquet schema metadata key holding the digest of the CSV a copy was made from
+_FOODS_CSV_DIGEST_KEY = b'foods_csv_blake2b'
+
+
+def _foods_csv_digest(csv_bytes: bytes) -> bytes:
+    """Hex digest identifying the contents of a foods CSV."""
+    return hashlib.blake2b(csv_bytes, digest_size=16).hexdigest().encode()
+
+
+@cache_data
+def _load_foods(foods_csv_path: str = 'foods.csv') -> Dict[str, np.ndarray]:
+    """
+    Load the foods table as a dict of column arrays.
+    
+    Reads the Parquet copy produced by scripts/convert_foods.py when it
+    exists next to the CSV and was made from the CSV's current contents,
+    falling back to parsing the CSV so edits to it take effect before the
+    copy is regenerated. File times are not used, since a fresh clone
+    gives both files the same one.
+    """
+    with open(foods_csv_path, 'rb') as f:
+        csv_bytes = f.read()
+    
+    parquet_path = os.path.splitext(foods_csv_path)[0] + '.parquet'
+    parquet_digest = None
+    if os.path.exists(parquet_path):
+        parquet_digest = (pq.read_schema(parquet_path).metadata or {}).get(_FOODS_CSV_DIGEST_KEY)
+    
+    if parquet_digest == _foods_csv_digest(csv_bytes):
+        df = pd.read_parquet(parquet_path)
+    else:
+        df = pd.read_csv(io.BytesIO(csv_bytes))
+    
+    # Nutrient values are small and only ever shown to one decimal place,
+    # so float32 is plenty and halves the memory of those columns
+    nutrient_columns = ('calories_per_100g', 'protein_g', 'carbs_g', 'fat_g', 'fiber_g')
+    return {
+        col: df[col].to_numpy(dtype=np.float32 if col in nutrient_columns else None)
+        for col in df.columns
+    }
+
 class MealPlanner:
     """Generates personalized Indian meal plans based on user preference."""
     
     def __init__(self, foods_csv_path: str = 'foods.csv'):
-        self.foods_df = pd.read_csv(foods_csv_path)
+        foods = _load_foods(foods_csv_path)
+        
+        # Column arrays (structure of arrays) for vectorized meal selection
+        self._nutrient_columns = ('calories_per_100g', 'protein_g', 'carbs_g', 'fat_g', 'fiber_g')
+        self._nutrient_keys = ('calories', 'protein', 'carbs', 'fat', 'fiber')
+        self._arrays = {col: foods[col] for col in self._nutrient_columns}
+        self._names = foods['name'].astype(object)
+        self._categories = foods['category'].astype(object)
+        self._veg_mask = foods['vegetarian'].astype(bool)
+        self._vegan_mask = foods['vegan'].astype(bool)
+        self._region_codes = foods['region'].astype(object)
+        self._all_mask = np.ones(len(self._names), dtype=bool)
+        
+        # filter_foods hands these out without copying
+        for mask in (self._veg_mask, self._vegan_mask, self._all_mask):
+            mask.flags.writeable = False
+        
+        # Filter results never change for a given preference, so variations share them
+        self._filter_indices = functools.lru_cache(maxsize=16)(self._filter_indices_impl)
+        
         self.meal_structure = {
             'breakfast': {'calories_pct': 0.25, 'foods_count': 2},
             'morning_snack': {'calories_pct': 0.10, 'foods_count': 1},
@@ -15,8 +94,15 @@ class MealPlanner:
             'evening_snack': {'calories_pct': 0.10, 'foods_count': 1},
             'dinner': {'calories_pct': 0.20, 'foods_count': 2}
         }
+        self._meal_kcal_split = functools.lru_cache(maxsize=2048)(self._meal_kcal_split_impl)
+        
+        # Foods table mask of the appropriate categories for each meal
+        self._meal_masks = {
+            meal_type: np.isin(self._categories, categories)
+            for meal_type, categories in _MEAL_CATEGORIES.items()
+        }
     
-    def filter_foods(self, dietary_preference: str, region: str) -> pd.DataFrame:
+    def filter_foods(self, dietary_preference: str, region: str) -> np.ndarray:
         """
         Filter foods based on dietary preferences and regional cuisine.
         
@@ -25,100 +111,127 @@ class MealPlanner:
             region: 'North Indian', 'South Indian', 'All Regions'
             
         Returns:
-            Filtered DataFrame
+            Read-only boolean mask over the foods table
         """
-        filtered_df: pd.DataFrame = self.foods_df.copy()
-        
         # Filter by dietary preference
         if dietary_preference == 'Vegetarian':
-            filtered_df = filtered_df.loc[filtered_df['vegetarian'] == True].copy()
+            mask = self._veg_mask
         elif dietary_preference == 'Vegan':
-            filtered_df = filtered_df.loc[filtered_df['vegan'] == True].copy()
-        # Non-vegetarian includes all foods
+            mask = self._vegan_mask
+        else:
+            # Non-vegetarian includes all foods
+            mask = self._all_mask
         
         # Filter by region
         if region != 'All Regions':
-            region_key = region.split()[0].lower()  # 'North' or 'South'
-            filtered_df = filtered_df.loc[
-                (filtered_df['region'] == region_key.capitalize()) | 
-                (filtered_df['region'] == 'All')
-            ].copy()
+            region_key = region.split()[0].capitalize()  # 'North' or 'South'
+            mask = mask & np.isin(self._region_codes, [region_key, 'All'])
+            mask.flags.writeable = False
         
-        return filtered_df
+        return mask
+    
+    def _filter_indices_impl(self, dietary_preference: str, region: str) -> np.ndarray:
+        """Return the read-only row indices of foods passing filter_foods."""
+        indices = np.flatnonzero(self.filter_foods(dietary_preference, region))
+        indices.flags.writeable = False
+        return indices
     
-    def select_foods_for_meal(self, available_foods: pd.DataFrame, 
+    def select_foods_for_meal(self, available_indices: np.ndarray, 
                             target_calories: int, foods_count: int,
-                            meal_type: str) -> List[Dict]:
+                            meal_type: str,
+                            rng: Optional[np.random.Generator] = None) -> List[Dict]:
         """
         Select foods for a specific meal to meet calorie target.
         
         Args:
-            available_foods: Filtered foods DataFrame
+            available_indices: Row indices of foods allowed by the user's filters
             target_calories: Target calories for this meal
             foods_count: Number of food items to select
             meal_type: Type of meal (breakfast, lunch, etc.)
+            rng: Random generator to draw foods with (fresh one if None)
             
         Returns:
             List of selected foods with serving sizes
         """
-        selected_foods = []
-        remaining_calories = target_calories
-        
-        # Define meal-appropriate food categories
-        meal_categories = {
-            'breakfast': ['Grains', 'South Indian', 'Dairy', 'Fruits', 'Beverages'],
-            'morning_snack': ['Fruits', 'Nuts', 'Snacks', 'Beverages'],
-            'lunch': ['Grains', 'Lentils', 'Vegetables', 'Dairy', 'Non-Veg'],
-            'evening_snack': ['Snacks', 'Fruits', 'Nuts', 'Beverages'],
-            'dinner': ['Grains', 'Lentils', 'Vegetables', 'South Indian', 'Non-Veg']
-        }
+        return self._foods_to_dicts(*self._select_meal_arrays(
+            available_indices, target_calories, foods_count, meal_type, rng
+        ))
+    
+    def _meal_kcal_split_impl(self, target_calories: int) -> Tuple[int, ...]:
+        """Return per-meal calorie targets in meal_structure order."""
+        return tuple(
+            int(target_calories * meal_config['calories_pct'])
+            for meal_config in self.meal_structure.values()
+        )
+    
+    def _select_meal_arrays(self, available_indices: np.ndarray,
+                            target_calories: int, foods_count: int, meal_type: str,
+                            rng: Optional[np.random.Generator] = None
+                            ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Array form of select_foods_for_meal.
+        
+        Returns:
+            Selected row indices, serving sizes in whole grams, and a
+            (foods, nutrients) matrix ordered like self._nutrient_keys,
+            rounded to one decimal
+        """
+        candidates = available_indices
+        meal_mask = self._meal_masks.get(meal_type)
+        if meal_mask is not None:
+            meal_foods = available_indices[meal_mask[available_indices]]
+            if meal_foods.size > 0:
+                candidates = meal_foods
         
-        appropriate_categories = meal_categories.get(meal_type, available_foods['category'].dropna().astype(str).unique().tolist())
-        meal_foods: pd.DataFrame = available_foods.loc[available_foods['category'].isin(appropriate_categories)].copy()
+        if rng is None:
+            rng = np.random.default_rng()
         
-        if meal_foods.empty:
-            meal_foods = available_foods.copy()
+        # Select distinct random foods from appropriate categories
+        idx = rng.choice(candidates, size=min(foods_count, candidates.size), replace=False)
         
-        for i in range(foods_count):
-            if meal_foods.empty:
-                break
-                
-            # Select random food from appropriate categories
-            food_row = meal_foods.sample(n=1).iloc[0]
-            
-            # Calculate serving size to contribute to remaining calories
-            calories_per_100g = food_row['calories_per_100g']
-            if calories_per_100g == 0:
-                serving_size = 100  # Default serving
+        # Serving sizes depend on the calories left over by earlier picks,
+        # so they are resolved one food at a time
+        calories_per_100g = self._arrays['calories_per_100g'][idx].tolist()
+        servings = np.empty(idx.size)
+        remaining_calories = float(target_calories)
+        for i, cal_per_100g in enumerate(calories_per_100g):
+            if cal_per_100g == 0:
+                serving_size = 100.0  # Default serving
             else:
                 # Aim for equal distribution of remaining calories
                 target_food_calories = remaining_calories / (foods_count - i)
-                serving_size = max(25, min(200, (target_food_calories / calories_per_100g) * 100))
-            
-            # Calculate actual nutritional values for this serving
-            actual_calories = (calories_per_100g * serving_size) / 100
-            actual_protein = (food_row['protein_g'] * serving_size) / 100
-            actual_carbs = (food_row['carbs_g'] * serving_size) / 100
-            actual_fat = (food_row['fat_g'] * serving_size) / 100
-            actual_fiber = (food_row['fiber_g'] * serving_size) / 100
-            
-            selected_foods.append({
-                'name': food_row['name'],
-                'category': food_row['category'],
-                'serving_size': round(serving_size, 0),
-                'calories': round(actual_calories, 1),
-                'protein': round(actual_protein, 1),
-                'carbs': round(actual_carbs, 1),
-                'fat': round(actual_fat, 1),
-                'fiber': round(actual_fiber, 1)
-            })
-            
-            remaining_calories -= actual_calories
-            
-            # Remove selected food to avoid repetition
-            meal_foods = meal_foods[meal_foods['name'] != food_row['name']]
+                serving_size = max(25.0, min(200.0, (target_food_calories / cal_per_100g) * 100))
+            servings[i] = serving_size
+            remaining_calories -= (cal_per_100g * serving_size) / 100
+        
+        # Calculate actual nutritional values for all servings at once
+        per_100g = np.column_stack([self._arrays[col][idx] for col in self._nutrient_columns])
+        nutrients = per_100g * servings[:, None] / 100
         
-        return selected_foods
+        # Round for display in one pass over each array
+        np.round(nutrients, 1, out=nutrients)
+        np.round(servings, 0, out=servings)
+        
+        return idx, servings, nutrients
+    
+    def _foods_to_dicts(self, idx: np.ndarray, servings: np.ndarray,
+                        nutrients: np.ndarray) -> List[Dict]:
+        """Materialize selected food arrays as the per-food dicts used for display."""
+        return [
+            {
+                'name': name,
+                'category': category,
+                'serving_size': serving_size,
+                'calories': calories,
+                'protein': protein,
+                'carbs': carbs,
+                'fat': fat,
+                'fiber': fiber
+            }
+            for name, category, serving_size, (calories, protein, carbs, fat, fiber) in zip(
+                self._names[idx], self._categories[idx], servings.tolist(), nutrients.tolist()
+            )
+        ]
     
     def generate_meal_plan(self, target_nutrition: Dict, dietary_preference: str, 
                           region: str, variation: int = 1) -> Dict:
@@ -134,51 +247,42 @@ class MealPlanner:
         Returns:
             Complete meal plan dictionary
         """
-        # Set random seed for variation
-        random.seed(variation * 42)
-        np.random.seed(variation * 42)
+        # Seeded per call so variations are reproducible without touching global RNG state
+        rng = np.random.default_rng(variation * 42)
         
         # Filter foods based on preferences
-        available_foods = self.filter_foods(dietary_preference, region)
+        available_indices = self._filter_indices(dietary_preference, region)
         
-        if available_foods.empty:
+        if available_indices.size == 0:
             raise ValueError("No foods available for the selected preferences")
         
         meal_plan = {}
-        total_nutrition = {'calories': 0, 'protein': 0, 'carbs': 0, 'fat': 0, 'fiber': 0}
+        meal_nutrients = []
         
         target_calories = target_nutrition['calories']
         
         # Generate each meal
-        for meal_type, meal_config in self.meal_structure.items():
-            meal_calories = int(target_calories * meal_config['calories_pct'])
+        meal_kcal_split = self._meal_kcal_split(target_calories)
+        for (meal_type, meal_config), meal_calories in zip(self.meal_structure.items(),
+                                                           meal_kcal_split):
             foods_count = meal_config['foods_count']
             
-            selected_foods = self.select_foods_for_meal(
-                available_foods, meal_calories, foods_count, meal_type
+            idx, servings, nutrients = self._select_meal_arrays(
+                available_indices, meal_calories, foods_count, meal_type, rng
             )
+            meal_nutrients.append(nutrients)
             
             # Calculate meal totals
-            meal_totals = {
-                'calories': sum(food['calories'] for food in selected_foods),
-                'protein': sum(food['protein'] for food in selected_foods),
-                'carbs': sum(food['carbs'] for food in selected_foods),
-                'fat': sum(food['fat'] for food in selected_foods),
-                'fiber': sum(food['fiber'] for food in selected_foods)
-            }
-            
-            # Update total nutrition
-            for nutrient in total_nutrition:
-                total_nutrition[nutrient] += meal_totals[nutrient]
+            meal_totals = nutrients.sum(axis=0).round(1)
             
             meal_plan[meal_type] = {
-                'foods': selected_foods,
-                'totals': meal_totals
+                'foods': self._foods_to_dicts(idx, servings, nutrients),
+                'totals': dict(zip(self._nutrient_keys, meal_totals.tolist()))
             }
         
-        # Round total nutrition values
-        for nutrient in total_nutrition:
-            total_nutrition[nutrient] = round(total_nutrition[nutrient], 1)
+        # Daily totals over every food of every meal
+        daily_totals = np.concatenate(meal_nutrients).sum(axis=0).round(1)
+        total_nutrition = dict(zip(self._nutrient_keys, daily_totals.tolist()))
         
         return {
             'meals': meal_plan,
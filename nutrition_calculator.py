@@ -1,3 +1,4 @@
+import functools
 import numpy as np
 import pandas as pd
 from typing import Dict, Tuple
@@ -19,6 +20,19 @@ class NutritionCalculator:
             'Maintenance': 0.0,
             'Muscle Gain': 0.15   # 15% surplus
         }
+        
+        # Mifflin-St Jeor constant by gender
+        self._gender_offset = {'male': 5, 'female': -161, 'm': 5, 'f': -161}
+        
+        # Grams per daily calorie for a 25% protein / 45% carbs / 30% fat split
+        # (protein: 4 cal/g, carbs: 4 cal/g, fat: 9 cal/g)
+        self._macro_ratios = np.array([0.25 / 4, 0.45 / 4, 0.30 / 9], dtype=np.float32)
+        self._macro_keys = ('protein', 'carbs', 'fat')
+        self._macro_grams = functools.lru_cache(maxsize=128)(self._macro_grams_impl)
+        
+        # BMR/TDEE are recomputed with identical inputs on each rerun
+        self.calculate_bmr = functools.lru_cache(maxsize=256)(self.calculate_bmr)
+        self.calculate_tdee = functools.lru_cache(maxsize=256)(self.calculate_tdee)
     
     def calculate_bmr(self, weight: float, height: float, age: int, gender: str) -> float:
         """
@@ -33,12 +47,9 @@ class NutritionCalculator:
         Returns:
             BMR in calories
         """
-        if gender.lower() == 'male':
-            bmr = 10 * weight + 6.25 * height - 5 * age + 5
-        else:  # female
-            bmr = 10 * weight + 6.25 * height - 5 * age - 161
-            
-        return bmr
+        # Anything not recognised as male uses the female constant, as before
+        offset = self._gender_offset.get(gender.lower(), -161)
+        return 10 * weight + 6.25 * height - 5 * age + offset
     
     def calculate_tdee(self, bmr: float, activity_level: str) -> float:
         """
@@ -82,21 +93,12 @@ class NutritionCalculator:
         Returns:
             Dictionary with macro targets in grams
         """
-        protein_calories = daily_calories * 0.25
-        carb_calories = daily_calories * 0.45
-        fat_calories = daily_calories * 0.30
-        
-        # Convert calories to grams (protein: 4 cal/g, carbs: 4 cal/g, fat: 9 cal/g)
-        protein_g = int(protein_calories / 4)
-        carbs_g = int(carb_calories / 4)
-        fat_g = int(fat_calories / 9)
-        
-        return {
-            'calories': daily_calories,
-            'protein': protein_g,
-            'carbs': carbs_g,
-            'fat': fat_g
-        }
+        grams = self._macro_grams(daily_calories)
+        return {'calories': daily_calories, **dict(zip(self._macro_keys, grams))}
+    
+    def _macro_grams_impl(self, daily_calories: int) -> Tuple[int, int, int]:
+        """Return (protein, carbs, fat) grams for the given daily calories."""
+        return tuple((daily_calories * self._macro_ratios).astype(np.int32).tolist())
     
     def get_bmi(self, weight: float, height: float) -> Tuple[float, str]:
         """
@@ -4,60 +4,204 @@ from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
+from reportlab.graphics.shapes import Drawing, String
+from reportlab.graphics.charts.piecharts import Pie
+from collections import OrderedDict
+import functools
+import hashlib
 import io
-import base64
-from typing import Dict, List, Optional
+import json
+import threading
+import numpy as np
+from types import MappingProxyType
+from typing import Dict, Final, List, Optional
 import tempfile
 import os
 
+try:
+    import orjson
+except ImportError:  # fall back to the slower stdlib serializer for cache keys
+    orjson = None
+
+def _build_styles():
+    """Build the sample stylesheet plus the custom paragraph styles for the PDF."""
+    styles = getSampleStyleSheet()
+    
+    # Section headings (and the meal titles built on them) always introduce
+    # the flowable after them, so never leave one alone at a page bottom
+    styles['Heading2'].keepWithNext = 1
+    
+    styles.add(ParagraphStyle(
+        name='CustomTitle',
+        parent=styles['Title'],
+        fontSize=24,
+        textColor=colors.darkblue,
+        spaceAfter=20,
+        alignment=TA_CENTER
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='MealTitle',
+        parent=styles['Heading2'],
+        fontSize=16,
+        textColor=colors.darkgreen,
+        spaceAfter=10,
+        spaceBefore=15,
+        leftIndent=20
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='FoodItem',
+        parent=styles['Normal'],
+        fontSize=11,
+        leftIndent=40,
+        spaceAfter=3
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='NutritionSummary',
+        parent=styles['Normal'],
+        fontSize=12,
+        textColor=colors.darkblue,
+        spaceAfter=5,
+        leftIndent=20
+    ))
+    
+    return styles
+
+
+# Styles and display names are immutable once built, so they are created
+# once at import and shared by every PDF instead of rebuilt per call
+_STYLES = _build_styles()
+
+_USER_TABLE_STYLE: Final = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE')
+])
+
+_NUTRITION_TABLE_STYLE: Final = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
+])
+
+# (key, label, decimals) for each row of the Daily Nutrition Summary table
+_SUMMARY_ROWS = (
+    ('calories', 'Calories', 0),
+    ('protein', 'Protein (g)', 1),
+    ('carbs', 'Carbs (g)', 1),
+    ('fat', 'Fat (g)', 1)
+)
+
+_FOOD_TABLE_STYLE: Final = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+    ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+    ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('LINEBELOW', (0, 0), (-1, 0), 1, colors.black),
+    ('LINEBELOW', (0, -1), (-1, -1), 0.5, colors.grey)
+])
+
+_FOOD_TABLE_HEADER = ['Food', 'Serving (g)', 'Cal', 'P(g)', 'C(g)', 'F(g)']
+_FOOD_TABLE_COL_WIDTHS = [2*inch, 1*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.8*inch]
+
+# Per-meal total line of the detailed meal plan, filled from the totals dict
+_MEAL_TOTAL_FMT = ("<b>Meal Total:</b> {calories:.0f} calories, {protein:.1f}g protein, "
+                   "{carbs:.1f}g carbs, {fat:.1f}g fat")
+
+_MEAL_NAMES = MappingProxyType({
+    'breakfast': 'Breakfast',
+    'morning_snack': 'Morning Snack',
+    'lunch': 'Lunch',
+    'evening_snack': 'Evening Snack',
+    'dinner': 'Dinner'
+})
+
+# Number of rendered meal plan PDFs each PDFGenerator keeps for repeat requests
+_PDF_CACHE_SIZE = 32
+
+
+def _pdf_cache_key(meal_plan: Dict, user_info: Dict) -> Optional[bytes]:
+    """
+    Digest of the report inputs, used as the key of the rendered PDF cache.
+    
+    Values the serializer does not know, such as NumPy scalars, are keyed by
+    their str(). Returns None if the inputs still cannot be serialized, in
+    which case the report is rendered without caching.
+    """
+    # Keys are sorted so dicts built in a different order still hit the cache
+    data = (meal_plan, user_info)
+    try:
+        if orjson is not None:
+            serialized = orjson.dumps(
+                data, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+            )
+        else:
+            serialized = json.dumps(data, sort_keys=True, default=str).encode()
+    except (TypeError, ValueError):
+        return None
+    return hashlib.blake2b(serialized, digest_size=16).digest()
+
+
+# Order meals appear in the reports, independent of the meal plan's dict order
+_MEAL_ORDER = ('breakfast', 'morning_snack', 'lunch', 'evening_snack', 'dinner')
+
+
+def _check_meal_types(meals: Dict):
+    """Raise ValueError if meals has a meal type without a display name."""
+    unknown = meals.keys() - _MEAL_NAMES.keys()
+    if unknown:
+        raise ValueError(f"Unknown meal types: {', '.join(sorted(unknown))}")
+
+
+def _open_output(output_path: Optional[str] = None):
+    """Open output_path for writing, or a new temporary .pdf file if it is None."""
+    if output_path is None:
+        return tempfile.NamedTemporaryFile(suffix='.pdf', delete=False, buffering=1 << 20)
+    return open(output_path, 'wb', buffering=1 << 20)
+
+
+@functools.lru_cache(maxsize=1024)
+def _parsed_frags(text: str, style_name: str) -> tuple:
+    """Parse the markup of a static paragraph once and keep its fragments."""
+    return tuple(Paragraph(text, _STYLES[style_name]).frags)
+
+
+def _para(text: str, style_name: str) -> Paragraph:
+    """
+    Create a Paragraph for repeated static text without re-parsing its markup.
+    
+    Paragraphs hold layout state once wrapped, so a fresh one is built on
+    every call; only the parsed fragments are cached, and cloned so a
+    paragraph can never alter the cached copies.
+    """
+    frags = [frag.clone() for frag in _parsed_frags(text, style_name)]
+    return Paragraph(text, _STYLES[style_name], frags=frags)
+
+
 class PDFGenerator:
     """Generates PDF reports for meal plan."""
     
     def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self.setup_custom_styles()
-    
-    def setup_custom_styles(self):
-        """Setup custom paragraph styles for the PDF."""
-        self.styles.add(ParagraphStyle(
-            name='CustomTitle',
-            parent=self.styles['Title'],
-            fontSize=24,
-            textColor=colors.darkblue,
-            spaceAfter=20,
-            alignment=TA_CENTER
-        ))
-        
-        self.styles.add(ParagraphStyle(
-            name='MealTitle',
-            parent=self.styles['Heading2'],
-            fontSize=16,
-            textColor=colors.darkgreen,
-            spaceAfter=10,
-            spaceBefore=15,
-            leftIndent=20
-        ))
-        
-        self.styles.add(ParagraphStyle(
-            name='FoodItem',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            leftIndent=40,
-            spaceAfter=3
-        ))
-        
-        self.styles.add(ParagraphStyle(
-            name='NutritionSummary',
-            parent=self.styles['Normal'],
-            fontSize=12,
-            textColor=colors.darkblue,
-            spaceAfter=5,
-            leftIndent=20
-        ))
+        self.styles = _STYLES
+        
+        # Rendered meal plan PDFs by input digest, least recently used first
+        self._pdf_cache: 'OrderedDict[bytes, bytes]' = OrderedDict()
+        self._pdf_cache_lock = threading.Lock()
     
-    def create_macro_chart(self, nutrition_data: Dict) -> str:
+    def create_macro_chart(self, nutrition_data: Dict) -> Optional[Drawing]:
         """
         Create a pie chart for macro distribution.
         
@@ -65,7 +209,8 @@ class PDFGenerator:
             nutrition_data: Dictionary with calories, protein, carbs, fat
             
         Returns:
-            Base64 encoded image string
+            Vector drawing that can be added to a story directly, or None
+            if there are no macro calories to chart
         """
         # Calculate macro calories
         protein_cal = nutrition_data['protein'] * 4
@@ -75,35 +220,36 @@ class PDFGenerator:
         total_macro_cal = protein_cal + carbs_cal + fat_cal
         
         if total_macro_cal == 0:
-            return ""
+            return None
         
         # Calculate percentages
-        protein_pct = (protein_cal / total_macro_cal) * 100
-        carbs_pct = (carbs_cal / total_macro_cal) * 100
-        fat_pct = (fat_cal / total_macro_cal) * 100
+        macro_cals = np.array([protein_cal, carbs_cal, fat_cal])
+        protein_pct, carbs_pct, fat_pct = (macro_cals * (100.0 / total_macro_cal)).tolist()
         
         # Create pie chart
-        fig, ax = plt.subplots(figsize=(8, 8))
-        
-        sizes = [protein_pct, carbs_pct, fat_pct]
-        labels = [f'Protein\n{protein_pct:.1f}%\n({nutrition_data["protein"]}g)',
-                 f'Carbs\n{carbs_pct:.1f}%\n({nutrition_data["carbs"]}g)',
-                 f'Fat\n{fat_pct:.1f}%\n({nutrition_data["fat"]}g)']
-        colors_list = ['#ff9999', '#66b3ff', '#99ff99']
-        
-        wedges, texts = ax.pie(sizes, labels=labels, colors=colors_list,
-                              autopct=None, startangle=90, textprops={'fontsize': 12})
-        
-        ax.set_title('Macro Distribution', fontsize=16, fontweight='bold', pad=20)
-        
-        # Save to base64
-        buffer = io.BytesIO()
-        plt.savefig(buffer, format='png', bbox_inches='tight', dpi=150)
-        buffer.seek(0)
-        image_base64 = base64.b64encode(buffer.getvalue()).decode()
-        
-        plt.close()
-        return image_base64
+        drawing = Drawing(300, 230)
+        drawing.hAlign = 'CENTER'
+        drawing.add(String(150, 212, 'Macro Distribution', textAnchor='middle',
+                           fontName='Helvetica-Bold', fontSize=16))
+        
+        pie = Pie()
+        pie.x, pie.y = 65, 15
+        pie.width = pie.height = 170
+        pie.data = [protein_cal, carbs_cal, fat_cal]
+        pie.labels = [f'Protein {protein_pct:.1f}% ({nutrition_data["protein"]}g)',
+                      f'Carbs {carbs_pct:.1f}% ({nutrition_data["carbs"]}g)',
+                      f'Fat {fat_pct:.1f}% ({nutrition_data["fat"]}g)']
+        pie.startAngle = 90
+        pie.direction = 'anticlockwise'
+        pie.sideLabels = True
+        pie.slices.strokeColor = colors.white
+        pie.slices.fontName = 'Helvetica'
+        pie.slices.fontSize = 10
+        for i, hex_color in enumerate(['#ff9999', '#66b3ff', '#99ff99']):
+            pie.slices[i].fillColor = colors.HexColor(hex_color)
+        
+        drawing.add(pie)
+        return drawing
     
     def generate_meal_plan_pdf(self, meal_plan: Dict, user_info: Dict, 
                              output_path: Optional[str] = None) -> str:
@@ -118,23 +264,67 @@ class PDFGenerator:
         Returns:
             Path to generated PDF file
         """
-        if output_path is None:
-            output_path = tempfile.mktemp(suffix='.pdf')
+        pdf_bytes = self._cached_meal_plan_pdf(meal_plan, user_info)
+        with _open_output(output_path) as output_file:
+            output_file.write(pdf_bytes)
+        
+        return output_file.name
+    
+    def generate_meal_plan_pdf_bytes(self, meal_plan: Dict, user_info: Dict) -> bytes:
+        """
+        Generate the meal plan report in memory.
+        
+        Args:
+            meal_plan: Complete meal plan dictionary
+            user_info: User information dictionary
+            
+        Returns:
+            PDF file contents
+        """
+        return self._cached_meal_plan_pdf(meal_plan, user_info)
+    
+    def _cached_meal_plan_pdf(self, meal_plan: Dict, user_info: Dict) -> bytes:
+        """Return the rendered report, reusing it if these inputs were seen recently."""
+        key = _pdf_cache_key(meal_plan, user_info)
+        if key is not None:
+            with self._pdf_cache_lock:
+                pdf_bytes = self._pdf_cache.get(key)
+                if pdf_bytes is not None:
+                    self._pdf_cache.move_to_end(key)
+                    return pdf_bytes
+        
+        buffer = io.BytesIO()
+        self._build_meal_plan_pdf(buffer, meal_plan, user_info)
+        pdf_bytes = buffer.getvalue()
+        
+        if key is not None:
+            with self._pdf_cache_lock:
+                self._pdf_cache[key] = pdf_bytes
+                if len(self._pdf_cache) > _PDF_CACHE_SIZE:
+                    self._pdf_cache.popitem(last=False)
+        return pdf_bytes
+    
+    def _build_meal_plan_pdf(self, target, meal_plan: Dict, user_info: Dict):
+        """Render the meal plan report to a file path or writable file object."""
+        _check_meal_types(meal_plan['meals'])
         
         # Create document
-        doc = SimpleDocTemplate(output_path, pagesize=A4,
+        # invariant drops the build timestamps and random document ID, so
+        # identical inputs produce byte-identical files
+        doc = SimpleDocTemplate(target, pagesize=A4,
                               rightMargin=72, leftMargin=72,
-                              topMargin=72, bottomMargin=18)
+                              topMargin=72, bottomMargin=18,
+                              invariant=1)
         
         story = []
         
         # Title
-        title = Paragraph("Personalized Indian Nutrition Plan", self.styles['CustomTitle'])
+        title = _para("Personalized Indian Nutrition Plan", 'CustomTitle')
         story.append(title)
         story.append(Spacer(1, 20))
         
         # User Information Section
-        story.append(Paragraph("User Profile", self.styles['Heading2']))
+        story.append(_para("User Profile", 'Heading2'))
         
         user_data = [
             ['Age:', f"{user_info.get('age', 'N/A')} years"],
@@ -151,90 +341,76 @@ class PDFGenerator:
             user_data.append(['BMI:', f"{user_info['bmi']} ({user_info['bmi_category']})"])
         
         user_table = Table(user_data, colWidths=[2*inch, 3*inch])
-        user_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE')
-        ]))
+        user_table.setStyle(_USER_TABLE_STYLE)
         
         story.append(user_table)
         story.append(Spacer(1, 30))
         
         # Nutrition Summary
-        story.append(Paragraph("Daily Nutrition Summary", self.styles['Heading2']))
+        story.append(_para("Daily Nutrition Summary", 'Heading2'))
         
         daily_totals = meal_plan['daily_totals']
         target_nutrition = meal_plan['target_nutrition']
         
-        nutrition_data = [
-            ['Nutrient', 'Target', 'Actual', 'Difference'],
-            ['Calories', f"{target_nutrition['calories']}", 
-             f"{daily_totals['calories']:.0f}", 
-             f"{daily_totals['calories'] - target_nutrition['calories']:+.0f}"],
-            ['Protein (g)', f"{target_nutrition['protein']}", 
-             f"{daily_totals['protein']:.1f}", 
-             f"{daily_totals['protein'] - target_nutrition['protein']:+.1f}"],
-            ['Carbs (g)', f"{target_nutrition['carbs']}", 
-             f"{daily_totals['carbs']:.1f}", 
-             f"{daily_totals['carbs'] - target_nutrition['carbs']:+.1f}"],
-            ['Fat (g)', f"{target_nutrition['fat']}", 
-             f"{daily_totals['fat']:.1f}", 
-             f"{daily_totals['fat'] - target_nutrition['fat']:+.1f}"]
+        # Pack both sides once and read rows by position
+        keys = [key for key, _, _ in _SUMMARY_ROWS]
+        targets = np.fromiter((target_nutrition[key] for key in keys),
+                              dtype=np.float64, count=len(keys))
+        actuals = np.fromiter((daily_totals[key] for key in keys),
+                              dtype=np.float64, count=len(keys))
+        diffs = actuals - targets
+        
+        nutrition_data = [['Nutrient', 'Target', 'Actual', 'Difference']] + [
+            [label, f"{target:g}", f"{actual:.{decimals}f}", f"{diff:+.{decimals}f}"]
+            for (_, label, decimals), target, actual, diff in zip(
+                _SUMMARY_ROWS, targets.tolist(), actuals.tolist(), diffs.tolist()
+            )
         ]
         
         nutrition_table = Table(nutrition_data, colWidths=[1.5*inch, 1*inch, 1*inch, 1*inch])
-        nutrition_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-        ]))
+        nutrition_table.setStyle(_NUTRITION_TABLE_STYLE)
         
         story.append(nutrition_table)
+        story.append(Spacer(1, 20))
+        
+        macro_chart = self.create_macro_chart(daily_totals)
+        if macro_chart is not None:
+            story.append(macro_chart)
         story.append(Spacer(1, 30))
         
         # Meal Plan Details
-        story.append(Paragraph("Detailed Meal Plan", self.styles['Heading2']))
-        
-        meal_names = {
-            'breakfast': 'Breakfast',
-            'morning_snack': 'Morning Snack',
-            'lunch': 'Lunch', 
-            'evening_snack': 'Evening Snack',
-            'dinner': 'Dinner'
-        }
+        story.append(_para("Detailed Meal Plan", 'Heading2'))
         
-        for meal_type, meal_data in meal_plan['meals'].items():
+        meals = meal_plan['meals']
+        for meal_type in _MEAL_ORDER:
+            meal_data = meals.get(meal_type)
+            if meal_data is None:
+                continue
+            
             # Meal title
-            story.append(Paragraph(meal_names.get(meal_type, meal_type.title()), 
-                                 self.styles['MealTitle']))
+            story.append(_para(_MEAL_NAMES[meal_type], 'MealTitle'))
             
-            # Food items
-            for food in meal_data['foods']:
-                food_text = (f"• {food['name']} - {food['serving_size']:.0f}g "
-                           f"({food['calories']:.0f} cal, {food['protein']:.1f}g protein, "
-                           f"{food['carbs']:.1f}g carbs, {food['fat']:.1f}g fat)")
-                story.append(Paragraph(food_text, self.styles['FoodItem']))
+            # Food items, laid out as one table per meal
+            foods = meal_data['foods']
+            if foods:
+                food_rows = [_FOOD_TABLE_HEADER] + [
+                    [food['name'], f"{food['serving_size']:.0f}", f"{food['calories']:.0f}",
+                     f"{food['protein']:.1f}", f"{food['carbs']:.1f}", f"{food['fat']:.1f}"]
+                    for food in foods
+                ]
+                food_table = Table(food_rows, colWidths=_FOOD_TABLE_COL_WIDTHS)
+                food_table.setStyle(_FOOD_TABLE_STYLE)
+                story.append(food_table)
+                story.append(Spacer(1, 5))
             
             # Meal totals
-            totals = meal_data['totals']
-            total_text = (f"<b>Meal Total:</b> {totals['calories']:.0f} calories, "
-                         f"{totals['protein']:.1f}g protein, {totals['carbs']:.1f}g carbs, "
-                         f"{totals['fat']:.1f}g fat")
+            total_text = _MEAL_TOTAL_FMT.format_map(meal_data['totals'])
             story.append(Paragraph(total_text, self.styles['NutritionSummary']))
             story.append(Spacer(1, 15))
         
         # Additional Notes
         story.append(Spacer(1, 30))
-        story.append(Paragraph("Important Notes", self.styles['Heading2']))
+        story.append(_para("Important Notes", 'Heading2'))
         
         notes = [
             "• This meal plan is generated based on your inputs and general nutritional guidelines.",
@@ -245,12 +421,10 @@ class PDFGenerator:
         ]
         
         for note in notes:
-            story.append(Paragraph(note, self.styles['Normal']))
+            story.append(_para(note, 'Normal'))
         
         # Build PDF
         doc.build(story)
-        
-        return output_path
     
     def generate_comparison_pdf(self, variations: List[Dict], user_info: Dict,
                               output_path: Optional[str] = None) -> str:
@@ -265,17 +439,10 @@ class PDFGenerator:
         Returns:
             Path to generated PDF file
         """
-        if output_path is None:
-            output_path = tempfile.mktemp(suffix='.pdf')
-        
-        doc = SimpleDocTemplate(output_path, pagesize=A4,
-                              rightMargin=72, leftMargin=72,
-                              topMargin=72, bottomMargin=18)
-        
         story = []
         
         # Title
-        title = Paragraph("Indian Nutrition Plan - Multiple Variations", self.styles['CustomTitle'])
+        title = _para("Indian Nutrition Plan - Multiple Variations", 'CustomTitle')
         story.append(title)
         story.append(Spacer(1, 30))
         
@@ -288,29 +455,31 @@ class PDFGenerator:
             meal_plan = variation_data['meal_plan']
             
             # Variation header
-            var_title = Paragraph(f"Variation {variation_num}", self.styles['Heading1'])
+            var_title = _para(f"Variation {variation_num}", 'Heading1')
             story.append(var_title)
             story.append(Spacer(1, 20))
             
             # Add meal plan content (similar to single plan but condensed)
             self._add_condensed_meal_plan(story, meal_plan)
         
-        doc.build(story)
-        return output_path
+        with _open_output(output_path) as output_file:
+            doc = SimpleDocTemplate(output_file, pagesize=A4,
+                                  rightMargin=72, leftMargin=72,
+                                  topMargin=72, bottomMargin=18,
+                                  invariant=1)
+            doc.build(story)
+        return output_file.name
     
     def _add_condensed_meal_plan(self, story: List, meal_plan: Dict):
         """Add a condensed version of meal plan to the story."""
-        meal_names = {
-            'breakfast': 'Breakfast',
-            'morning_snack': 'Morning Snack', 
-            'lunch': 'Lunch',
-            'evening_snack': 'Evening Snack',
-            'dinner': 'Dinner'
-        }
-        
-        for meal_type, meal_data in meal_plan['meals'].items():
-            story.append(Paragraph(meal_names.get(meal_type, meal_type.title()),
-                                 self.styles['MealTitle']))
+        meals = meal_plan['meals']
+        _check_meal_types(meals)
+        for meal_type in _MEAL_ORDER:
+            meal_data = meals.get(meal_type)
+            if meal_data is None:
+                continue
+            
+            story.append(_para(_MEAL_NAMES[meal_type], 'MealTitle'))
             
             # Condensed food list
             food_names = [food['name'] for food in meal_data['foods']]
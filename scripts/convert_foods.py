@@ -0,0 +1,39 @@
+"""
+Convert the foods database from CSV to Parquet.
+
+MealPlanner loads foods.parquet when it sits next to foods.csv and was
+converted from the CSV's current contents, which avoids re-parsing the
+CSV on startup. Re-run this script after editing foods.csv, or the
+planner falls back to the CSV:
+
+    python scripts/convert_foods.py
+"""
+import io
+import os
+import sys
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from meal_planner import _FOODS_CSV_DIGEST_KEY, _foods_csv_digest
+
+
+def convert(csv_path: str, parquet_path: str) -> None:
+    """Write the CSV at csv_path to parquet_path, tagged with the CSV's digest."""
+    with open(csv_path, 'rb') as f:
+        csv_bytes = f.read()
+    
+    table = pa.Table.from_pandas(pd.read_csv(io.BytesIO(csv_bytes)), preserve_index=False)
+    metadata = {**(table.schema.metadata or {}), _FOODS_CSV_DIGEST_KEY: _foods_csv_digest(csv_bytes)}
+    pq.write_table(table.replace_schema_metadata(metadata), parquet_path)
+
+
+if __name__ == '__main__':
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(ROOT, 'foods.csv')
+    parquet_path = os.path.splitext(csv_path)[0] + '.parquet'
+    convert(csv_path, parquet_path)
+    print(f"Wrote {parquet_path}")